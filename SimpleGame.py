@@ -10,7 +10,7 @@ Features added:
 - Build/packaging notes at bottom
 
 Save as: pygame_boss_battle_enhanced.py
-Run: pip install pygame
+Run: pip install pygame numpy
      python pygame_boss_battle_enhanced.py
 
 Place optional assets in ./assets: music.ogg, shoot.wav, hit.wav, explode.wav, boss_hit.wav, powerup.wav
@@ -22,13 +22,30 @@ import sys
 import math
 import os
 import json
-from collections import deque
+import time
+import atexit
+import tempfile
+import threading
+import gc
+from bisect import bisect
+from itertools import accumulate
+import numpy as np
+try:
+    from numba import njit
+except ImportError:  # optional accelerator, the pure-Python paths are used without it
+    njit = None
+try:
+    import orjson
+except ImportError:  # optional, faster highscore encoding
+    orjson = None
 
 # --------- Configuration ---------
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 720
 FPS = 60
 MAX_PARTICLES = 400  # cap for performance
+RNG = np.random.default_rng()  # batched draws for particle bursts
+_rand = random.random  # scalar draws: the C builtin, skipping uniform()/randint()'s Python-level frames
 ASSET_DIR = os.path.join(os.path.dirname(__file__), "assets")
 HIGHSCORE_FILE = os.path.join(os.path.dirname(__file__), "highscores.json")
 
@@ -46,11 +63,48 @@ DARK_GRAY = (28, 28, 34)
 def clamp(v, a, b):
     return max(a, min(b, v))
 
+# draw culling: does the box, shifted by the camera offset, touch the screen?
+def visible(x, y, w, h, ox, oy):
+    return x-ox < SCREEN_WIDTH and x-ox+w > 0 and y-oy < SCREEN_HEIGHT and y-oy+h > 0
+
+# weighted pick from a precomputed cumulative table, like random.choices without rebuilding it
+def pick(items, cum):
+    return items[bisect(cum, _rand()*cum[-1], 0, len(cum)-1)]
+
+# sine lookup table; angles are indexed in 1/TRIG_N turns
+TRIG_N = 4096
+_SIN = np.sin(np.arange(TRIG_N)*(2*math.pi/TRIG_N)).astype(np.float32)
+_RAD2IDX = TRIG_N/(2*math.pi)
+_SIN_L = _SIN.tolist()  # scalar lookups: list indexing beats numpy scalar indexing
+
+# cached circle sprites (filled, or a ring when width>0), blitted instead of rasterizing circles every frame
+CIRCLE_SPRITES = {}
+def circle_sprite(color, r, width=0):
+    spr = CIRCLE_SPRITES.get((color, r, width))
+    if spr is None:
+        spr = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
+        pygame.draw.circle(spr, color, (r, r), r, width)
+        if pygame.display.get_surface(): spr = spr.convert_alpha()
+        CIRCLE_SPRITES[(color, r, width)] = spr
+    return spr
+
+# same idea for solid boxes; opaque, so they take the plain convert() fast path
+RECT_SPRITES = {}
+def rect_sprite(color, w, h):
+    spr = RECT_SPRITES.get((color, w, h))
+    if spr is None:
+        spr = pygame.Surface((w, h)); spr.fill(color)
+        if pygame.display.get_surface(): spr = spr.convert()
+        RECT_SPRITES[(color, w, h)] = spr
+    return spr
+
 # ---------------- Assets & Audio -----------------
+PLAYER_ROT_STEPS = 64
 class Assets:
     def __init__(self):
         self.sounds = {}
         self.music = None
+        self.player_img = None; self.player_rot = None
         self.load()
 
     def load(self):
@@ -68,9 +122,21 @@ class Assets:
                 m = os.path.join(ASSET_DIR, "music.ogg")
                 if os.path.exists(m):
                     self.music = m
+                # optional ship sprite, drawn facing +x
+                p = os.path.join(ASSET_DIR, "player.png")
+                if os.path.exists(p):
+                    self.player_img = pygame.image.load(p)
         except Exception as e:
             print("Asset load error:", e)
 
+    def player_rotation(self, angle):
+        # ship sprite for an aim angle from a 64-step rotation LUT, so draw never calls transform.rotate;
+        # built on first use because convert_alpha() needs the display
+        if self.player_rot is None:
+            img = self.player_img.convert_alpha()
+            self.player_rot = [pygame.transform.rotate(img, -a*360/PLAYER_ROT_STEPS).convert_alpha() for a in range(PLAYER_ROT_STEPS)]
+        return self.player_rot[round(angle*PLAYER_ROT_STEPS/(2*math.pi)) % PLAYER_ROT_STEPS]
+
 ASSETS = Assets()
 
 # ---------------- High Scores -----------------
@@ -83,97 +149,188 @@ def load_highscores():
             return []
     return []
 
-def save_highscores(scores):
+def write_highscores(scores):
+    # atomic write: temp file in the same directory, then rename over the old file
+    tmp = None
     try:
-        with open(HIGHSCORE_FILE, 'w') as f:
-            json.dump(scores, f)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(HIGHSCORE_FILE), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(scores) if orjson else json.dumps(scores).encode())
+        os.replace(tmp, HIGHSCORE_FILE); tmp = None
     except Exception as e:
         print('Could not save highscores:', e)
+    finally:
+        if tmp and os.path.exists(tmp): os.remove(tmp)
+
+class HighscoreSaver:
+    # writes on a daemon thread so disk I/O never stalls a frame; saves within interval seconds coalesce
+    def __init__(self, interval=5.0):
+        self.interval = interval; self._pending = None; self._seq = 0; self._written = 0
+        self._cv = threading.Condition(); self._io = threading.Lock(); self._thread = None
+
+    def save(self, scores):
+        with self._cv:
+            self._seq += 1; self._pending = (self._seq, list(scores))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True); self._thread.start()
+            self._cv.notify()
+
+    def flush(self):
+        with self._cv:
+            job, self._pending = self._pending, None
+        with self._io:  # also waits out a write the thread already has in flight
+            if job: self._write(*job)
+
+    def _write(self, seq, scores):
+        # caller holds self._io; never let an older snapshot land after a newer one
+        if seq > self._written:
+            write_highscores(scores); self._written = seq
+
+    def _run(self):
+        while True:
+            with self._cv:
+                while self._pending is None: self._cv.wait()
+                job, self._pending = self._pending, None
+                self._io.acquire()  # taken before the job leaves the lock, so flush() can't slip in ahead of it
+            try: self._write(*job)
+            finally: self._io.release()
+            time.sleep(self.interval)
+
+HIGHSCORE_SAVER = HighscoreSaver()
+atexit.register(HIGHSCORE_SAVER.flush)
+
+def save_highscores(scores):
+    HIGHSCORE_SAVER.save(scores)
 
 # default highscores
 HIGHSCORES = load_highscores()
 
 # ---------------- Particle System -----------------
-class Particle:
-    __slots__ = ('x','y','vx','vy','life','max_life','r','color')
-    def __init__(self, x, y, vx, vy, life, r=3, color=ORANGE):
-        self.x = x; self.y = y; self.vx = vx; self.vy = vy; self.life = life; self.max_life = life; self.r = r; self.color = color
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.12
-        self.life -= 1
+PARTICLE_COLORS = [ORANGE, YELLOW, RED, PURPLE]
 
-    def draw(self, surf, offset=(0,0)):
-        if self.life > 0:
-            ox, oy = offset
-            pygame.draw.circle(surf, self.color, (int(self.x-ox), int(self.y-oy)), max(1, int(self.r * (self.life/self.max_life))))
+def particle_color_index(color):
+    try:
+        return PARTICLE_COLORS.index(color)
+    except ValueError:
+        PARTICLE_COLORS.append(color); return len(PARTICLE_COLORS)-1
 
+# structure-of-arrays particles; the live ones occupy slots [:n]
 class ParticleSystem:
     def __init__(self):
-        self.particles = []
+        N = MAX_PARTICLES
+        self.x = np.zeros(N, np.float32); self.y = np.zeros(N, np.float32)
+        self.vx = np.zeros(N, np.float32); self.vy = np.zeros(N, np.float32)
+        self.life = np.zeros(N, np.float32); self.r = np.zeros(N, np.float32)
+        self.shrink = np.zeros(N, np.float32)  # r/max_life, so the drawn radius is just life*shrink
+        self.color = np.zeros(N, np.uint8)
+        self._arrays = (self.x, self.y, self.vx, self.vy, self.life, self.r, self.shrink, self.color)
+        self._sprites = []  # [color index][radius] -> sprite
+        self.n = 0
 
     def emit_explosion(self, x, y, count=20, color=ORANGE):
-        if len(self.particles) > MAX_PARTICLES:
+        count = min(count, MAX_PARTICLES - self.n)
+        if count <= 0:
             return
-        for _ in range(count):
-            angle = random.random() * 2 * math.pi
-            speed = random.uniform(1, 6)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            p = Particle(x, y, vx, vy, life=random.randint(18, 42), r=random.randint(2,5), color=color)
-            self.particles.append(p)
+        a = self.n; b = a + count
+        angle = RNG.random(count, np.float32) * np.float32(2 * math.pi)
+        speed = RNG.uniform(1, 6, count)
+        self.x[a:b] = x; self.y[a:b] = y
+        self.vx[a:b] = np.cos(angle) * speed
+        self.vy[a:b] = np.sin(angle) * speed
+        self.life[a:b] = RNG.integers(18, 43, count)
+        self.r[a:b] = RNG.integers(2, 6, count); self.shrink[a:b] = self.r[a:b] / self.life[a:b]
+        self.color[a:b] = particle_color_index(color)
+        self.n = b
 
     def update(self):
-        for p in self.particles[:]:
-            p.update()
-            if p.life <= 0:
-                self.particles.remove(p)
+        n = self.n
+        if n == 0:
+            return
+        if _step_particles:
+            if not _step_particles(self.x, self.y, self.vx, self.vy, self.life, n): return
+            alive = self.life[:n] > 0
+        else:
+            self.x[:n] += self.vx[:n]
+            self.y[:n] += self.vy[:n]
+            self.vy[:n] += 0.12
+            self.life[:n] -= 1
+            alive = self.life[:n] > 0
+        if not alive.all():
+            keep = np.nonzero(alive)[0]; m = len(keep)
+            for arr in self._arrays: arr[:m] = arr[keep]
+            self.n = m
 
     def draw(self, surf, offset=(0,0)):
-        for p in self.particles:
-            p.draw(surf, offset)
+        n = self.n
+        if n == 0:
+            return
+        ox, oy = offset
+        xs = (self.x[:n] - ox).astype(np.int32); ys = (self.y[:n] - oy).astype(np.int32)
+        rs = np.maximum(1, (self.life[:n] * self.shrink[:n]).astype(np.int32))
+        vis = (xs > -8) & (xs < SCREEN_WIDTH+8) & (ys > -8) & (ys < SCREEN_HEIGHT+8)
+        sprites = self._sprites
+        if len(sprites) != len(PARTICLE_COLORS): sprites[:] = [[None]+[circle_sprite(c, r) for r in range(1, 6)] for c in PARTICLE_COLORS]
+        surf.blits([(sprites[c][r], (x-r, y-r)) for x, y, r, c in zip(xs[vis].tolist(), ys[vis].tolist(), rs[vis].tolist(), self.color[:n][vis].tolist())], False)
 
 PARTICLES = ParticleSystem()
 
 # ---------------- Camera (shake) -----------------
 class Camera:
+    __slots__ = ('offx','offy','timer','mag')
     def __init__(self):
         self.offx = 0; self.offy = 0; self.timer = 0; self.mag = 0
     def shake(self, duration, mag):
         self.timer = duration; self.mag = mag
     def update(self):
         if self.timer>0:
-            self.timer -=1
-            self.offx = random.uniform(-1,1)*self.mag
-            self.offy = random.uniform(-1,1)*self.mag
+            self.timer -=1; mag = self.mag*2
+            self.offx = (_rand()-0.5)*mag
+            self.offy = (_rand()-0.5)*mag
         else:
             self.offx = 0; self.offy = 0
 CAMERA = Camera()
 
 # ---------------- Background -----------------
-class Star:
-    def __init__(self):
-        self.x = random.uniform(0, SCREEN_WIDTH)
-        self.y = random.uniform(0, SCREEN_HEIGHT)
-        self.z = random.uniform(0.3,1.0)
+# one parallax layer: stars rendered once onto a screen-sized surface that scrolls as a whole.
+# With a bg color the layer is opaque and doubles as the screen clear; otherwise black is keyed out.
+class StarLayer:
+    __slots__ = ('z','y','surf')
+    def __init__(self, count, zmin, zmax, bg=None):
+        self.z = (zmin+zmax)/2; self.y = 0.0
+        self.surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if bg: self.surf.fill(bg)
+        # positions and depth buckets drawn as arrays, stamped with cached dot sprites in one blits()
+        xs = RNG.integers(0, SCREEN_WIDTH, count); ys = RNG.integers(0, SCREEN_HEIGHT, count)
+        rs = (1 + (1-RNG.uniform(zmin, zmax, count))*2).astype(np.int32)
+        dots = {r: circle_sprite(WHITE, r) for r in set(rs.tolist())}
+        self.surf.blits([(dots[r], (x-r, y-r)) for x, y, r in zip(xs.tolist(), ys.tolist(), rs.tolist())], False)
+        if pygame.display.get_surface(): self.surf = self.surf.convert()
+        if not bg: self.surf.set_colorkey(BLACK, pygame.RLEACCEL)
     def update(self, speed):
-        self.y += speed*self.z
-        if self.y > SCREEN_HEIGHT:
-            self.y = 0; self.x = random.uniform(0, SCREEN_WIDTH)
+        self.y = (self.y + speed*self.z) % SCREEN_HEIGHT
     def draw(self, surf):
-        r = int(1 + (1-self.z)*2)
-        pygame.draw.circle(surf, WHITE, (int(self.x), int(self.y)), r)
-STARS = [Star() for _ in range(140)]
+        y = int(self.y)
+        surf.blit(self.surf, (0, y)); surf.blit(self.surf, (0, y-SCREEN_HEIGHT))
+
+BG_COLOR = (8,10,16)
+
+def make_starfield(count=140):
+    # the far layer is opaque and repaints the whole screen, so Game.draw needs no fill()
+    return [StarLayer(count//2, 0.3, 0.65, bg=BG_COLOR), StarLayer(count-count//2, 0.65, 1.0)]
 
 # ---------------- Entities -----------------
+SPREAD2 = np.radians((-6.0, 0.0, 6.0)); SPREAD2_C = np.cos(SPREAD2); SPREAD2_S = np.sin(SPREAD2)  # weapon lv2 fan
+SPREAD3 = math.radians(10)  # weapon lv3 random cone half-angle
+TRI_C, TRI_S = math.cos(2.4), math.sin(2.4)  # rear vertices of the player triangle sit at aim +-2.4 rad
+
 class Player:
     def __init__(self, x, y):
         self.x = x; self.y = y; self.w = 36; self.h = 36
         self.speed = 5.4; self.hp = 5; self.max_hp = 5
-        self.fire_rate = 10; self.fire_timer = 0; self.bullets = []
+        self.fire_rate = 10; self.fire_timer = 0; self.bullets = Bullets()
         self.bomb_cd = 0; self.score = 0; self.lives = 3; self.weapon_lv = 1
+        self.rect = pygame.Rect(int(x), int(y), self.w, self.h)
+        self._aim = None; self._tri = None; self._pts = [None]*3
 
     def handle_input(self, keys):
         dx=dy=0
@@ -184,53 +341,122 @@ class Player:
         if dx!=0 and dy!=0: dx*=0.7071; dy*=0.7071
         self.x += dx*self.speed; self.y += dy*self.speed
         self.x = clamp(self.x,0,SCREEN_WIDTH-self.w); self.y = clamp(self.y,0,SCREEN_HEIGHT-self.h)
+        self.rect.x = int(self.x); self.rect.y = int(self.y)
 
     def update(self):
         if self.fire_timer>0: self.fire_timer-=1
         if self.bomb_cd>0: self.bomb_cd-=1
-        for b in self.bullets[:]:
-            b.update();
-            if b.off(): self.bullets.remove(b)
+        self.bullets.update()
 
-    def draw(self, surf, offset=(0,0)):
+    def draw(self, surf, offset=(0,0), mouse_pos=(0,0)):
         ox,oy=offset
         px=int(self.x-ox); py=int(self.y-oy)
-        mx,my = pygame.mouse.get_pos()
-        angle = math.atan2((my-oy)-py, (mx-ox)-px)
-        pts=[(px+math.cos(angle)*18, py+math.sin(angle)*18), (px+math.cos(angle+2.4)*16, py+math.sin(angle+2.4)*16), (px+math.cos(angle-2.4)*16, py+math.sin(angle-2.4)*16)]
-        pygame.draw.polygon(surf, GREEN, pts)
+        mx,my = mouse_pos
+        aim = round(math.atan2((my-oy)-py, (mx-ox)-px)*128)
+        if ASSETS.player_img:
+            img = ASSETS.player_rotation(aim/128); surf.blit(img, (px-img.get_width()//2, py-img.get_height()//2))
+        else: self.draw_ship(surf, px, py, aim)
         # HP bar
         hw=56; hx=px-hw//2+self.w//2; hy=py+28
         pygame.draw.rect(surf, DARK_GRAY, (hx,hy,hw,8)); pygame.draw.rect(surf, RED, (hx,hy,int(hw*(self.hp/self.max_hp)),8))
 
+    def draw_ship(self, surf, px, py, aim):
+        # procedural fallback: a triangle around (px, py); vertex offsets are cached per aim angle
+        # (quantized to 1/128 rad), only the translation changes per frame
+        if aim != self._aim:
+            angle = aim/128; self._aim = aim; c = math.cos(angle); s = math.sin(angle)
+            self._tri = ((c*18, s*18), ((c*TRI_C-s*TRI_S)*16, (s*TRI_C+c*TRI_S)*16), ((c*TRI_C+s*TRI_S)*16, (s*TRI_C-c*TRI_S)*16))
+        pts = self._pts
+        for i,(ux,uy) in enumerate(self._tri): pts[i] = (px+ux, py+uy)
+        pygame.draw.polygon(surf, GREEN, pts)
+
     def shoot(self, tx, ty):
         if self.fire_timer>0: return
-        bx=self.x+self.w/2; by=self.y+self.h/2; ang=math.atan2(ty-by, tx-bx)
+        bx=self.x+self.w/2; by=self.y+self.h/2; dx=tx-bx; dy=ty-by; d2=dx*dx+dy*dy
+        # unit aim vector; spreads rotate it by precomputed (cos, sin) instead of going through atan2
+        if d2>1e-9: inv=1.0/math.sqrt(d2); dx*=inv; dy*=inv
+        else: dx=1.0; dy=0.0
         if self.weapon_lv==1:
-            bullets=[Bullet(bx,by,ang,10,1)]; self.fire_timer=self.fire_rate
+            self.bullets.spawn(bx,by,dx,dy,10,1); self.fire_timer=self.fire_rate
         elif self.weapon_lv==2:
-            bullets=[Bullet(bx,by,ang+math.radians(-6),11,1), Bullet(bx,by,ang,11,1), Bullet(bx,by,ang+math.radians(6),11,1)]; self.fire_timer=max(6,self.fire_rate-2)
+            c=SPREAD2_C; s=SPREAD2_S; self.bullets.spawn(bx,by,dx*c-dy*s,dx*s+dy*c,11,1); self.fire_timer=max(6,self.fire_rate-2)
         else:
-            bullets=[Bullet(bx,by,ang+math.radians(random.uniform(-10,10)),12,1) for _ in range(5)]; self.fire_timer=max(4,self.fire_rate-4)
-        self.bullets.extend(bullets)
+            off=RNG.uniform(-SPREAD3, SPREAD3, 5); c=np.cos(off); s=np.sin(off)
+            self.bullets.spawn(bx,by,dx*c-dy*s,dx*s+dy*c,12,1); self.fire_timer=max(4,self.fire_rate-4)
         if ASSETS.sounds.get('shoot'): ASSETS.sounds['shoot'].play()
 
+    def take_damage(self, amount=1, shake=(12,6)):
+        # returns True when the hit costs the last life
+        self.hp-=amount; CAMERA.shake(*shake)
+        if ASSETS.sounds.get('hit'): ASSETS.sounds['hit'].play()
+        if self.hp<=0:
+            self.lives-=1
+            if self.lives<=0: return True
+            self.hp=self.max_hp
+        return False
+
     def drop_bomb(self):
         if self.bomb_cd<=0:
             self.bomb_cd = FPS*6
             return Bomb(self.x+self.w//2, self.y+self.h//2)
         return None
 
-class Bullet:
-    __slots__=('x','y','vx','vy','r','dmg')
-    def __init__(self,x,y,ang,speed=10,dmg=1): self.x=x; self.y=y; self.vx=math.cos(ang)*speed; self.vy=math.sin(ang)*speed; self.r=4; self.dmg=dmg
-    def update(self): self.x+=self.vx; self.y+=self.vy
-    def draw(self,surf,offset=(0,0)): ox,oy=offset; pygame.draw.circle(surf, YELLOW, (int(self.x-ox), int(self.y-oy)), self.r)
-    def get_rect(self): return pygame.Rect(int(self.x-self.r), int(self.y-self.r), self.r*2, self.r*2)
-    def off(self): return self.x<-60 or self.x>SCREEN_WIDTH+60 or self.y<-60 or self.y>SCREEN_HEIGHT+60
+MAX_BULLETS = 1024
+
+# structure-of-arrays player bullets, laid out like Enemies; live ones occupy [:n]
+class Bullets:
+    r = 4
+    def __init__(self, cap=MAX_BULLETS):
+        self.x = np.zeros(cap, np.float32); self.y = np.zeros(cap, np.float32)
+        self.vx = np.zeros(cap, np.float32); self.vy = np.zeros(cap, np.float32)
+        self.dmg = np.zeros(cap, np.float32); self.dead = np.zeros(cap, bool)
+        self._arrays = (self.x, self.y, self.vx, self.vy, self.dmg, self.dead)
+        self.n = 0
+
+    def __len__(self): return self.n
+    def clear(self): self.n = 0
+
+    def spawn(self, x, y, dx, dy, speed=10, dmg=1):
+        # (dx, dy) is a unit direction, or arrays of them for a volley from the same point
+        dx = np.atleast_1d(dx); dy = np.atleast_1d(dy)
+        i = self.n; j = min(i+len(dx), len(self.x)); k = j-i
+        if k <= 0: return
+        self.x[i:j] = x; self.y[i:j] = y; self.vx[i:j] = dx[:k]*speed; self.vy[i:j] = dy[:k]*speed
+        self.dmg[i:j] = dmg; self.dead[i:j] = False; self.n = j
+
+    def update(self):
+        # move, then drop whatever left the screen
+        n = self.n
+        if n == 0: return
+        x = self.x[:n]; y = self.y[:n]
+        if _step_bullets:
+            if not _step_bullets(self.x, self.y, self.vx, self.vy, n): return
+        else:
+            x += self.vx[:n]; y += self.vy[:n]
+        off = (x < -60) | (x > SCREEN_WIDTH+60) | (y < -60) | (y > SCREEN_HEIGHT+60)
+        if off.any(): self._keep(~off)
+
+    def sweep(self):
+        dead = self.dead[:self.n]
+        if dead.any(): self._keep(~dead)
+
+    def _keep(self, mask):
+        keep = np.nonzero(mask)[0]; m = len(keep)
+        for arr in self._arrays: arr[:m] = arr[keep]
+        self.n = m
+
+    def draw(self, surf, offset=(0,0)):
+        n = self.n
+        if n == 0: return
+        ox, oy = offset; r = self.r
+        xs = (self.x[:n] - ox).astype(np.int32) - r; ys = (self.y[:n] - oy).astype(np.int32) - r
+        vis = (xs < SCREEN_WIDTH) & (xs+2*r > 0) & (ys < SCREEN_HEIGHT) & (ys+2*r > 0)
+        spr = circle_sprite(YELLOW, r)
+        surf.blits([(spr, p) for p in zip(xs[vis].tolist(), ys[vis].tolist())], False)
 
 class Bomb:
-    def __init__(self,x,y): self.x=x; self.y=y; self.timer=FPS*2; self.expl=False; self.r=0; self.maxr=140
+    __slots__ = ('x','y','timer','expl','r','maxr','rect')
+    def __init__(self,x,y): self.x=x; self.y=y; self.timer=FPS*2; self.expl=False; self.r=0; self.maxr=140; self.rect=pygame.Rect(int(x), int(y), 0, 0)
     def update(self):
         if not self.expl:
             self.timer-=1
@@ -238,32 +464,95 @@ class Bomb:
                 self.expl=True; PARTICLES.emit_explosion(self.x,self.y, count=32, color=ORANGE); CAMERA.shake(18,8);
                 if ASSETS.sounds.get('explode'): ASSETS.sounds['explode'].play()
         else:
-            if self.r < self.maxr: self.r += 10
+            if self.r < self.maxr:
+                self.r += 10; self.rect.update(int(self.x-self.r), int(self.y-self.r), self.r*2, self.r*2)
     def draw(self,surf,offset=(0,0)): 
         ox,oy=offset; 
         if not self.expl:
-            if (self.timer//10)%2==0: pygame.draw.circle(surf, RED, (int(self.x-ox), int(self.y-oy)), 10)
-        else:
-            pygame.draw.circle(surf, YELLOW, (int(self.x-ox), int(self.y-oy)), int(self.r), 2)
-    def get_rect(self): return pygame.Rect(int(self.x-self.r), int(self.y-self.r), int(self.r*2), int(self.r*2))
+            if (self.timer//10)%2==0: surf.blit(circle_sprite(RED, 10), (int(self.x-ox)-10, int(self.y-oy)-10))
+        elif self.r > 0:
+            r=self.r; surf.blit(circle_sprite(YELLOW, r, 2), (int(self.x-ox)-r, int(self.y-oy)-r))
     def finished(self): return self.expl and self.r>=self.maxr
 
-# Enemy types
-class Enemy:
-    def __init__(self, x, y, kind='basic'):
-        self.x=x; self.y=y; self.w=36; self.h=36
-        self.kind=kind
-        if kind=='basic': self.hp=2; self.speed=2.2
-        elif kind=='fast': self.hp=1; self.speed=3.6
-        elif kind=='tank': self.hp=5; self.speed=1.0
-        elif kind=='zig': self.hp=3; self.speed=2.0; self.phase=0
+# Enemy types, indexed like ENEMY_KINDS
+ENEMY_KINDS = ('basic','fast','tank','zig')
+ENEMY_HP = (2, 1, 5, 3)
+ENEMY_SPEED = (2.2, 3.6, 1.0, 2.0)
+ENEMY_SCORE = (12, 12, 30, 12)
+ENEMY_COLORS = (RED, RED, PURPLE, RED)
+ZIG = ENEMY_KINDS.index('zig')
+ZIG_STEP = round(_RAD2IDX/6.0)  # zig phase advances 1/6 rad per frame, in sine-table steps
+MAX_ENEMIES = 256
+
+# structure-of-arrays enemies; the live ones occupy slots [:n], dead ones are compacted by sweep()
+class Enemies:
+    w = h = 36
+    def __init__(self, cap=MAX_ENEMIES):
+        self.x = np.zeros(cap, np.float32); self.y = np.zeros(cap, np.float32)
+        self.speed = np.zeros(cap, np.float32); self.hp = np.zeros(cap, np.float32)
+        self.kind = np.zeros(cap, np.int8); self.phase = np.zeros(cap, np.int32); self.dead = np.zeros(cap, bool)
+        self._arrays = (self.x, self.y, self.speed, self.hp, self.kind, self.phase, self.dead)
+        self.n = 0; self._sprites = None  # per-kind boxes, built on first draw
+
+    def __len__(self): return self.n
+    def clear(self): self.n = 0
+
+    def spawn(self, x, y, kind):
+        i = self.n
+        if i >= len(self.x): return
+        self.x[i]=x; self.y[i]=y; self.kind[i]=kind; self.hp[i]=ENEMY_HP[kind]; self.speed[i]=ENEMY_SPEED[kind]
+        self.phase[i]=0; self.dead[i]=False; self.n = i+1
+
     def update(self):
-        if self.kind=='zig': self.x += math.sin(self.phase/6.0)*2.6; self.phase+=1
-        self.y += self.speed
-    def draw(self,surf,offset=(0,0)): ox,oy=offset; color=RED if self.kind!='tank' else PURPLE; pygame.draw.rect(surf, color, (int(self.x-ox), int(self.y-oy), self.w, self.h))
-    def get_rect(self): return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
+        # returns how many enemies slipped past the bottom edge this frame
+        n = self.n
+        if n == 0: return 0
+        zig = self.kind[:n] == ZIG
+        if zig.any():
+            x = self.x[:n]; ph = self.phase[:n]
+            x[zig] += _SIN[ph[zig] & (TRIG_N-1)]*2.6; ph[zig] += ZIG_STEP
+        self.y[:n] += self.speed[:n]
+        off = ~self.dead[:n] & (self.y[:n] > SCREEN_HEIGHT+60)
+        self.dead[:n] |= off
+        return int(np.count_nonzero(off))
+
+    def overlapping(self, rect):
+        # indices of live enemies touching a pygame.Rect
+        n = self.n; x = self.x[:n]; y = self.y[:n]
+        m = ~self.dead[:n] & (x < rect.right) & (x+self.w > rect.left) & (y < rect.bottom) & (y+self.h > rect.top)
+        return np.nonzero(m)[0].tolist()
+
+    def sweep(self):
+        n = self.n
+        dead = self.dead[:n]
+        if dead.any():
+            keep = np.nonzero(~dead)[0]; m = len(keep)
+            for arr in self._arrays: arr[:m] = arr[keep]
+            self.n = m
+
+    def draw(self, surf, offset=(0,0)):
+        n = self.n
+        if n == 0: return
+        ox, oy = offset
+        xs = (self.x[:n] - ox).astype(np.int32); ys = (self.y[:n] - oy).astype(np.int32)
+        vis = ~self.dead[:n] & (xs < SCREEN_WIDTH) & (xs+self.w > 0) & (ys < SCREEN_HEIGHT) & (ys+self.h > 0)
+        if self._sprites is None: self._sprites = [rect_sprite(c, self.w, self.h) for c in ENEMY_COLORS]
+        spr = self._sprites
+        surf.blits([(spr[k], (x, y)) for x, y, k in zip(xs[vis].tolist(), ys[vis].tolist(), self.kind[:n][vis].tolist())], False)
 
 # Boss (mini and main)
+BOSS_FAN = tuple((math.sin(math.radians(a)), math.cos(math.radians(a))) for a in (-25,-10,0,10,25))  # phase-1 missile fan
+_BOSS_FONT = None
+_BOSS_LABELS = {}
+def boss_label(level):
+    # font and "BOSS LV.N" surfaces are built once, after pygame.font.init()
+    global _BOSS_FONT
+    lbl = _BOSS_LABELS.get(level)
+    if lbl is None:
+        if _BOSS_FONT is None: _BOSS_FONT = pygame.font.Font(None, 26)
+        lbl = _BOSS_LABELS[level] = _BOSS_FONT.render(f"BOSS LV.{level}", True, WHITE).convert_alpha()
+    return lbl
+
 class Boss:
     def __init__(self, level=1, mini=False):
         self.level=level; self.mini=mini
@@ -272,8 +561,10 @@ class Boss:
         self.target_y = 60 if not mini else 140
         self.hp = (180 + (level-1)*70) if not mini else (80 + (level-1)*30)
         self.max_hp = self.hp
-        self.entering=True; self.timer=0; self.missiles=[]; self.alive=True
-    def update(self, px, py):
+        self.entering=True; self.timer=0; self.missiles=Missiles(); self.alive=True
+        self.label = boss_label(level) if not mini else None
+        self.rect = pygame.Rect(int(self.x), int(self.y), self.w, self.h)
+    def update(self, px, py, ticks=0):
         if self.entering:
             self.y += 2.4 if not self.mini else 2.0
             if self.y >= self.target_y: self.entering=False; self.timer=0
@@ -283,27 +574,26 @@ class Boss:
             if hp_pct>0.66: phase=0
             elif hp_pct>0.33: phase=1
             else: phase=2
-            self.x += math.sin(pygame.time.get_ticks()*0.001 + self.level)*0.9
+            self.x += _SIN_L[int((ticks*0.001 + self.level)*_RAD2IDX) & (TRIG_N-1)]*0.9
             self.x = clamp(self.x,0,SCREEN_WIDTH-self.w)
             if not self.mini:
-                if phase==0 and self.timer%80==0: self.missiles.append(Missile(self.x+self.w//2, self.y+self.h, px, py, speed=4))
+                if phase==0 and self.timer%80==0: self.missiles.spawn(self.x+self.w//2, self.y+self.h, px, py, speed=4)
                 elif phase==1 and self.timer%52==0:
-                    for a in (-25,-10,0,10,25): ang=math.radians(a); tx=px+math.sin(ang)*200; ty=py+math.cos(ang)*200; self.missiles.append(Missile(self.x+self.w//2, self.y+self.h, tx, ty, speed=5))
-                elif phase==2 and self.timer%10==0: angle=random.uniform(-0.5,0.5); tx=px+math.sin(angle)*120; ty=py+math.cos(angle)*120; self.missiles.append(Missile(self.x+random.randint(20,self.w-20), self.y+self.h, tx, ty, speed=6))
+                    for s,c in BOSS_FAN: self.missiles.spawn(self.x+self.w//2, self.y+self.h, px+s*200, py+c*200, speed=5)
+                elif phase==2 and self.timer%10==0: angle=_rand()-0.5; tx=px+math.sin(angle)*120; ty=py+math.cos(angle)*120; self.missiles.spawn(self.x+20+int(_rand()*(self.w-39)), self.y+self.h, tx, ty, speed=6)
             else:
                 # mini boss simpler
-                if self.timer%36==0: self.missiles.append(Missile(self.x+self.w//2, self.y+self.h, px, py, speed=5))
-        for m in self.missiles[:]: m.update();
-        self.missiles=[m for m in self.missiles if not m.is_off()]
+                if self.timer%36==0: self.missiles.spawn(self.x+self.w//2, self.y+self.h, px, py, speed=5)
+        self.rect.x = int(self.x); self.rect.y = int(self.y)
+        self.missiles.update()
     def draw(self,surf,offset=(0,0)):
         ox,oy=offset; pygame.draw.rect(surf, PURPLE if not self.mini else ORANGE, (int(self.x-ox), int(self.y-oy), self.w, self.h))
         # hp bar
         bar_w=SCREEN_WIDTH-140; bx=70; by=16; pygame.draw.rect(surf, DARK_GRAY, (bx,by,bar_w,14)); pygame.draw.rect(surf, RED, (bx,by,int(bar_w*(self.hp/self.max_hp)),14))
         if not self.mini:
-            font=pygame.font.Font(None, 26); surf.blit(font.render(f"BOSS LV.{self.level}", True, WHITE),(bx+6,by-2))
-    def get_rect(self): return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
+            surf.blit(self.label,(bx+6,by-2))
     def take_damage(self,dmg):
-        self.hp-=dmg; PARTICLES.emit_explosion(random.randint(int(self.x),int(self.x+self.w)), random.randint(int(self.y),int(self.y+self.h)), count=6, color=PURPLE); CAMERA.shake(6,4);
+        self.hp-=dmg; PARTICLES.emit_explosion(int(self.x)+int(_rand()*(self.w+1)), int(self.y)+int(_rand()*(self.h+1)), count=6, color=PURPLE); CAMERA.shake(6,4);
         
         if ASSETS.sounds.get('boss_hit'):
             ASSETS.sounds['boss_hit'].play()
@@ -313,19 +603,117 @@ class Boss:
                 ASSETS.sounds['explode'].play(); return True
         return False
 
-class Missile:
-    def __init__(self,sx,sy,tx,ty,speed=4):
-        self.x=sx; self.y=sy; dx=tx-sx; dy=ty-sy; dist=math.hypot(dx,dy) or 1
-        self.vx = dx/dist*speed; self.vy = dy/dist*speed; self.trail=deque(maxlen=10)
-    def update(self): self.trail.appendleft((self.x,self.y)); self.x+=self.vx; self.y+=self.vy
-    def draw(self,surf,offset=(0,0)):
-        ox,oy=offset
-        for i,(tx,ty) in enumerate(self.trail): pygame.draw.circle(surf, ORANGE, (int(tx-ox),int(ty-oy)), max(1,4-i//3))
-        pygame.draw.rect(surf, DARK_GRAY, (int(self.x-ox)-4, int(self.y-oy)-8, 8, 16))
-    def get_rect(self): return pygame.Rect(int(self.x)-6, int(self.y)-8, 12, 16)
-    def is_off(self): return self.x<-60 or self.x>SCREEN_WIDTH+60 or self.y<-60 or self.y>SCREEN_HEIGHT+60
+TRAIL_LEN = 10
+TRAIL_ORDER = [(h + np.arange(TRAIL_LEN)) % TRAIL_LEN for h in range(TRAIL_LEN)]  # ring read order per head, newest first
+
+MAX_MISSILES = 256
+
+# structure-of-arrays boss missiles; trails are a (cap, TRAIL_LEN, 2) ring buffer sharing one head,
+# which works because every missile records a point on every update
+class Missiles:
+    def __init__(self, cap=MAX_MISSILES):
+        self.x = np.zeros(cap, np.float32); self.y = np.zeros(cap, np.float32)
+        self.vx = np.zeros(cap, np.float32); self.vy = np.zeros(cap, np.float32); self.dead = np.zeros(cap, bool)
+        self.trail = np.zeros((cap, TRAIL_LEN, 2), np.float32); self.head = 0
+        self._arrays = (self.x, self.y, self.vx, self.vy, self.dead, self.trail)
+        self.n = 0
+
+    def __len__(self): return self.n
+
+    def spawn(self, sx, sy, tx, ty, speed=4):
+        i = self.n
+        if i >= len(self.x): return
+        dx=tx-sx; dy=ty-sy; d2=dx*dx+dy*dy
+        k = speed/math.sqrt(d2) if d2>1e-9 else speed
+        self.x[i]=sx; self.y[i]=sy; self.vx[i]=dx*k; self.vy[i]=dy*k; self.dead[i]=False
+        self.trail[i] = (sx, sy); self.n = i+1
+
+    def update(self):
+        # record trail points, move, then compact the ones that hit the player or left the screen
+        n = self.n
+        if n == 0: return
+        self.head = h = (self.head-1) % TRAIL_LEN
+        x = self.x[:n]; y = self.y[:n]
+        if _step_missiles:
+            if not _step_missiles(self.x, self.y, self.vx, self.vy, self.dead, self.trail, h, n): return
+        else:
+            self.trail[:n, h, 0] = x; self.trail[:n, h, 1] = y
+            x += self.vx[:n]; y += self.vy[:n]
+        gone = self.dead[:n] | (x < -60) | (x > SCREEN_WIDTH+60) | (y < -60) | (y > SCREEN_HEIGHT+60)
+        if gone.any():
+            keep = np.nonzero(~gone)[0]; m = len(keep)
+            for arr in self._arrays: arr[:m] = arr[keep]
+            self.n = m
+
+    def overlapping(self, rect):
+        # indices of live missiles whose 12x16 hit box touches a pygame.Rect
+        n = self.n; x = self.x[:n]; y = self.y[:n]
+        m = ~self.dead[:n] & (x-6 < rect.right) & (x+6 > rect.left) & (y-8 < rect.bottom) & (y+8 > rect.top)
+        return np.nonzero(m)[0].tolist()
+
+    def draw(self, surf, offset=(0,0)):
+        n = self.n
+        if n == 0: return
+        ox, oy = offset
+        xs = (self.x[:n] - ox).astype(np.int32); ys = (self.y[:n] - oy).astype(np.int32)
+        # the box around a missile also covers its trail
+        vis = (xs-64 < SCREEN_WIDTH) & (xs+64 > 0) & (ys-64 < SCREEN_HEIGHT) & (ys+64 > 0)
+        if not vis.any(): return
+        trails = (self.trail[:n][vis][:, TRAIL_ORDER[self.head]] - (ox, oy)).astype(np.int32).tolist()
+        lines = pygame.draw.lines
+        for pts in trails: lines(surf, ORANGE, False, pts, 2)
+        body = rect_sprite(DARK_GRAY, 8, 16)
+        surf.blits([(body, (x-4, y-8)) for x, y in zip(xs[vis].tolist(), ys[vis].tolist())], False)
+
+# ---------------- Numeric kernels (numba, optional) -----------------
+if njit:
+    @njit(cache=True)
+    def _step_particles(x, y, vx, vy, life, n):
+        # integrate and age the live slice in one pass; returns how many particles died
+        dead = 0
+        for i in range(n):
+            x[i] += vx[i]; y[i] += vy[i]; vy[i] += 0.12; life[i] -= 1
+            if life[i] <= 0: dead += 1
+        return dead
+
+    @njit(cache=True)
+    def _step_bullets(x, y, vx, vy, n):
+        # move the live slice; returns how many bullets left the screen
+        off = 0
+        for i in range(n):
+            x[i] += vx[i]; y[i] += vy[i]
+            if x[i] < -60 or x[i] > SCREEN_WIDTH+60 or y[i] < -60 or y[i] > SCREEN_HEIGHT+60: off += 1
+        return off
+
+    @njit(cache=True)
+    def _step_missiles(x, y, vx, vy, dead, trail, h, n):
+        # record each trail point at head h and move, in one pass; returns how many missiles are gone
+        gone = 0
+        for i in range(n):
+            trail[i, h, 0] = x[i]; trail[i, h, 1] = y[i]
+            x[i] += vx[i]; y[i] += vy[i]
+            if dead[i] or x[i] < -60 or x[i] > SCREEN_WIDTH+60 or y[i] < -60 or y[i] > SCREEN_HEIGHT+60: gone += 1
+        return gone
+
+    @njit(cache=True)
+    def _resolve_hits(bx, by, bs, dmg, ex, ey, ew, eh, hp):
+        # first enemy each bullet hits, in bullet order; hp is consumed so dead enemies stop absorbing shots
+        hits = np.full(bx.shape[0], -1, np.int32)
+        for i in range(bx.shape[0]):
+            for j in range(ex.shape[0]):
+                if hp[j] > 0 and bx[i] < ex[j]+ew and bx[i]+bs > ex[j] and by[i] < ey[j]+eh and by[i]+bs > ey[j]:
+                    hits[i] = j; hp[j] -= dmg[i]
+                    break
+        return hits
+else:
+    _step_particles = _step_bullets = _step_missiles = _resolve_hits = None
 
 # ---------------- Game -----------------
+ENEMY_CUM_EARLY = tuple(accumulate((0.5,0.25,0.15,0.1)))
+ENEMY_CUM_LATE = tuple(accumulate((0.35,0.3,0.2,0.15)))
+POWERUP_TYPES = ('score','life','rapid','weapon')
+POWERUP_CUM = tuple(accumulate((0.6,0.15,0.15,0.1)))
+
 class Game:
     def __init__(self):
         pygame.init();
@@ -333,7 +721,9 @@ class Game:
         except Exception: pass
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption('Dodge & Shoot — Full Release')
-        self.clock = pygame.time.Clock(); self.font=pygame.font.Font(None,30); self.big=pygame.font.Font(None,72)
+        self.clock = pygame.time.Clock(); self.font=pygame.font.Font(None,30); self.big=pygame.font.Font(None,72); self._hud={}; self._text_cache={}
+        self.stars = make_starfield()
+        self.mouse = (0,0); self.ticks = 0  # per-frame input/clock snapshot, taken at the top of update()
         self.reset()
         # joystick
         self.joysticks = []
@@ -348,27 +738,52 @@ class Game:
                 print('Music load failed:', e)
 
     def reset(self):
-        self.player = Player(SCREEN_WIDTH//2, SCREEN_HEIGHT-150); self.enemies=[]; self.bombs=[]; self.spawn_timer=0; self.wave=1
+        self.player = Player(SCREEN_WIDTH//2, SCREEN_HEIGHT-150); self.enemies=Enemies(); self.bombs=[]; self.spawn_timer=0; self.wave=1
         self.enemy_spawn_rate=45; self.boss=None; self.boss_fight=False; self.mini_spawn=False; self.powerups=[]; self.running=True
-        self.game_over=False; self.menu=True; self.difficulty='Normal'; self.particles=PARTICLES; self.camera=CAMERA; self.stars=STARS
+        self.game_over=False; self.menu=True; self.difficulty='Normal'; self.particles=PARTICLES; self.camera=CAMERA
+
+    def bullet_hits(self):
+        # per-bullet index of the first enemy hit (-1 for a miss), in bullet order; hp is consumed along the
+        # way so an enemy killed by one bullet stops absorbing the next
+        bl = self.player.bullets; en = self.enemies; n = en.n; m = bl.n; r = bl.r
+        if not m: return []
+        if not n: return [-1]*m
+        hp = np.where(en.dead[:n], 0, en.hp[:n])
+        bx = bl.x[:m]-r; by = bl.y[:m]-r; ex = en.x[:n]; ey = en.y[:n]
+        if _resolve_hits: return _resolve_hits(bx, by, 2*r, bl.dmg[:m], ex, ey, en.w, en.h, hp).tolist()
+        # B x E overlap matrix; both sides are capped (MAX_BULLETS x MAX_ENEMIES) so this stays small
+        hit = (bx[:,None] < ex+en.w) & (bx[:,None]+2*r > ex) & (by[:,None] < ey+en.h) & (by[:,None]+2*r > ey) & (hp > 0)
+        any_hit = hit.any(axis=1)
+        hits = np.where(any_hit, hit.argmax(axis=1), -1)
+        # only the few bullets that hit something need a sequential pass, to re-aim ones whose target died first
+        dmg = bl.dmg[:m]
+        for i in np.nonzero(any_hit)[0].tolist():
+            j = hits[i]
+            if hp[j] <= 0:
+                live = np.nonzero(hit[i] & (hp > 0))[0]
+                hits[i] = j = live[0] if len(live) else -1
+                if j < 0: continue
+            hp[j] -= dmg[i]
+        return hits.tolist()
 
     def spawn_enemy(self):
-        kinds=['basic','fast','tank','zig']
-        weights=[0.5,0.25,0.15,0.1] if self.wave<3 else [0.35,0.3,0.2,0.15]
-        kind = random.choices(kinds, weights=weights)[0]
-        x=random.randint(20, SCREEN_WIDTH-60); y=-40
-        self.enemies.append(Enemy(x,y,kind))
+        kind = pick(range(len(ENEMY_KINDS)), ENEMY_CUM_EARLY if self.wave<3 else ENEMY_CUM_LATE)
+        x=20+int(_rand()*(SCREEN_WIDTH-79)); y=-40
+        self.enemies.spawn(x,y,kind)
 
     def spawn_powerup(self,x,y):
-        choices=['score','life','rapid','weapon']; t=random.choices(choices, weights=[0.6,0.15,0.15,0.1])[0]
-        self.powerups.append({'x':x,'y':y,'type':t,'timer':FPS*8})
+        t=pick(POWERUP_TYPES, POWERUP_CUM)
+        self.powerups.append({'x':x,'y':y,'type':t,'timer':FPS*8,'dead':False,'rect':pygame.Rect(int(x),int(y),18,18)})
 
     def start_boss(self, mini=False):
         self.boss_fight=True; self.boss=Boss(level=self.wave, mini=mini); self.enemies.clear(); self.player.bullets.clear(); self.bombs.clear(); self.powerups.clear()
 
     def update(self):
         if not self.running: return
-        self.camera.update(); [s.update(1.6 if self.boss_fight else 0.9) for s in self.stars]
+        self.mouse = pygame.mouse.get_pos(); self.ticks = pygame.time.get_ticks()
+        self.gc_pause(not (self.menu or self.game_over))
+        self.camera.update()
+        for s in self.stars: s.update(1.6 if self.boss_fight else 0.9)
         if self.menu or self.game_over: return
         # input
         keys = pygame.key.get_pressed(); self.player.handle_input(keys); self.player.update()
@@ -378,92 +793,70 @@ class Game:
             spawn_rate = max(14, int(self.enemy_spawn_rate - (self.player.score/220)))
             if self.spawn_timer>=spawn_rate:
                 self.spawn_enemy(); self.spawn_timer=0
-        # update enemies
-        for e in self.enemies[:]: 
-            e.update();
-            if e.y>SCREEN_HEIGHT+60:
-                self.enemies.remove(e); self.player.score+=2
+        # update enemies; removals below only mark objects dead, the sweep at the end compacts lists
+        self.player.score += 2*self.enemies.update()
         # bullets
-        for b in list(self.player.bullets): b.update()
+        bl = self.player.bullets; bl.update()
         # bombs
-        for bom in self.bombs[:]:
-            bom.update();
-            if bom.finished(): self.bombs.remove(bom)
+        for bom in self.bombs: bom.update()
+        self.bombs[:] = [bom for bom in self.bombs if not bom.finished()]
+        hits = self.bullet_hits()
         # collisions bullets->enemies
-        for b in list(self.player.bullets):
-            br=b.get_rect();
-            for e in self.enemies[:]:
-                if br.colliderect(e.get_rect()):
-                    try: self.player.bullets.remove(b)
-                    except: pass
-                    e.hp -= b.dmg; PARTICLES.emit_explosion(b.x,b.y,count=6,color=YELLOW)
-                    if e.hp<=0:
-                        try: self.enemies.remove(e)
-                        except: pass
-                        self.player.score += 12 if e.kind!='tank' else 30
-                        if ASSETS.sounds.get('hit'): ASSETS.sounds['hit'].play()
-                        if random.random()<0.28: self.spawn_powerup(e.x+e.w//2, e.y+e.h//2)
-                    break
-            if self.boss and self.boss.alive and br.colliderect(self.boss.get_rect()):
-                try: self.player.bullets.remove(b)
-                except: pass
-                killed = self.boss.take_damage(b.dmg)
+        en = self.enemies; bw = bl.r*2
+        # boss bounds hoisted out of the loop, pre-expanded by the bullet size so each test is two chained compares
+        bo = self.boss if self.boss and self.boss.alive else None
+        if bo: bx0 = bo.x-bw; bx1 = bo.x+bo.w; by0 = bo.y-bw; by1 = bo.y+bo.h
+        for i, (x, y, dmg) in enumerate(zip(bl.x[:bl.n].tolist(), bl.y[:bl.n].tolist(), bl.dmg[:bl.n].tolist())):
+            bx=x-bl.r; by=y-bl.r; j = hits[i]
+            if j >= 0:
+                bl.dead[i]=True
+                en.hp[j] -= dmg; PARTICLES.emit_explosion(x,y,count=6,color=YELLOW)
+                if en.hp[j]<=0:
+                    en.dead[j]=True
+                    self.player.score += ENEMY_SCORE[en.kind[j]]
+                    if ASSETS.sounds.get('hit'): ASSETS.sounds['hit'].play()
+                    if _rand()<0.28: self.spawn_powerup(float(en.x[j])+en.w//2, float(en.y[j])+en.h//2)
+                continue
+            if bo and bx0<bx<bx1 and by0<by<by1:
+                bl.dead[i]=True
+                killed = bo.take_damage(dmg)
                 if killed: self.on_boss_down();
                 break
         # explosions
-        for bom in self.bombs[:]:
+        for bom in self.bombs:
             if bom.expl:
-                rect = bom.get_rect() if hasattr(bom,'get_rect') else bom.get_explosion_rect()
+                rect = bom.rect
                 if rect:
-                    for e in self.enemies[:]:
-                        if rect.colliderect(e.get_rect()):
-                            try: self.enemies.remove(e)
-                            except: pass
-                            self.player.score += 8
-                    if self.boss and rect.colliderect(self.boss.get_rect()):
+                    killed = en.overlapping(rect)
+                    en.dead[killed] = True; self.player.score += 8*len(killed)
+                    if self.boss and rect.colliderect(self.boss.rect):
                         killed = self.boss.take_damage(10); 
                         if killed: self.on_boss_down()
-                    if rect.colliderect(pygame.Rect(self.player.x,self.player.y,self.player.w,self.player.h)):
-                        self.player.hp -=1; self.camera.shake(12,6)
-                        if ASSETS.sounds.get('hit'): ASSETS.sounds['hit'].play()
-                        if self.player.hp<=0:
-                            self.player.lives-=1
-                            if self.player.lives<=0: self.game_over=True
-                            else: self.player.hp=self.player.max_hp
+                    if rect.colliderect(self.player.rect) and self.player.take_damage(shake=(12,6)): self.game_over=True
         # boss missiles
-        if self.boss:
-            for m in list(self.boss.missiles):
-                if m.get_rect().colliderect(pygame.Rect(self.player.x,self.player.y,self.player.w,self.player.h)):
-                    try: self.boss.missiles.remove(m)
-                    except: pass
-                    self.player.hp-=1; self.camera.shake(10,5); PARTICLES.emit_explosion(self.player.x+self.player.w//2, self.player.y+self.player.h//2,count=12,color=RED)
-                    if ASSETS.sounds.get('hit'): ASSETS.sounds['hit'].play()
-                    if self.player.hp<=0:
-                        self.player.lives-=1
-                        if self.player.lives<=0: self.game_over=True
-                        else: self.player.hp=self.player.max_hp
+        if self.boss and self.boss.missiles:
+            missiles = self.boss.missiles
+            for i in missiles.overlapping(self.player.rect):
+                missiles.dead[i]=True
+                PARTICLES.emit_explosion(self.player.x+self.player.w//2, self.player.y+self.player.h//2,count=12,color=RED)
+                if self.player.take_damage(shake=(10,5)): self.game_over=True
         # enemies->player
-        for e in self.enemies[:]:
-            if pygame.Rect(self.player.x,self.player.y,self.player.w,self.player.h).colliderect(e.get_rect()):
-                try: self.enemies.remove(e)
-                except: pass
-                self.player.hp-=1; self.camera.shake(14,6)
-                if ASSETS.sounds.get('hit'): ASSETS.sounds['hit'].play()
-                if self.player.hp<=0:
-                    self.player.lives-=1
-                    if self.player.lives<=0: self.game_over=True
-                    else: self.player.hp=self.player.max_hp
+        for j in en.overlapping(self.player.rect):
+            en.dead[j]=True
+            if self.player.take_damage(shake=(14,6)): self.game_over=True
         # pick powerups
-        for p in self.powerups[:]:
-            pr=pygame.Rect(int(p['x']),int(p['y']),18,18)
-            if pr.colliderect(pygame.Rect(self.player.x,self.player.y,self.player.w,self.player.h)):
-                t=p['type']
+        if self.powerups:
+            for i in self.player.rect.collidelistall([p['rect'] for p in self.powerups]):
+                p=self.powerups[i]; t=p['type']
                 if t=='score': self.player.score += 50
                 elif t=='life': self.player.lives +=1
                 else: self.player.weapon_lv = min(3, self.player.weapon_lv+1)
-                try: self.powerups.remove(p)
-                except: pass
+                p['dead']=True
                 if ASSETS.sounds.get('powerup'): ASSETS.sounds['powerup'].play()
+        # sweep; boss missiles are compacted by Boss.update below, together with the off-screen ones
+        bl.sweep()
+        self.enemies.sweep()
+        self.powerups[:] = [p for p in self.powerups if not p['dead']]
         PARTICLES.update()
         if not self.boss_fight and self.player.score >= 2000*self.wave:
             # occasionally spawn mini-boss before main boss
@@ -472,7 +865,14 @@ class Game:
             else:
                 self.start_boss(mini=False)
         if self.boss_fight and self.boss:
-            self.boss.update(self.player.x+self.player.w//2, self.player.y+self.player.h//2)
+            self.boss.update(self.player.x+self.player.w//2, self.player.y+self.player.h//2, self.ticks)
+
+    def gc_pause(self, playing):
+        # no cyclic GC passes mid-fight (entity storage is preallocated, so little garbage is made);
+        # catch up in one collection as soon as we are back on the menu or game-over screen
+        if playing == gc.isenabled():
+            if playing: gc.disable()
+            else: gc.enable(); gc.collect()
 
     def on_boss_down(self):
         self.player.score += 800*self.wave
@@ -484,34 +884,49 @@ class Game:
         HIGHSCORES.append(self.player.score); HIGHSCORES.sort(reverse=True); HIGHSCORES[:] = HIGHSCORES[:10]; save_highscores(HIGHSCORES)
 
     def draw(self):
+        # full redraw on purpose: both star layers scroll every frame (and the camera shakes), so the dirty
+        # region is always the whole screen and LayeredDirty bookkeeping would only add cost
         off=(int(self.camera.offx), int(self.camera.offy))
-        self.screen.fill((8,10,16))
         for s in self.stars: s.draw(self.screen)
-        world = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), flags=pygame.SRCALPHA); world.fill((0,0,0,0))
-        for e in self.enemies: e.draw(world, off)
-        for b in self.bombs: b.draw(world, off)
-        if self.boss:
-            for m in self.boss.missiles: m.draw(world, off)
-        for bl in list(self.player.bullets): bl.draw(world, off)
-        self.player.draw(world, off)
-        if self.boss: self.boss.draw(world, off)
-        PARTICLES.draw(world, off)
-        for p in self.powerups: pygame.draw.rect(world, YELLOW if p['type']=='score' else (PURPLE if p['type']=='life' else GREEN), (int(p['x']), int(p['y']), 18, 18))
-        self.screen.blit(world, (off[0], off[1]))
+        screen = self.screen
+        ox, oy = off
+        self.enemies.draw(screen, off)
+        for b in self.bombs:
+            if visible(b.x-b.r-10, b.y-b.r-10, b.r*2+20, b.r*2+20, ox, oy): b.draw(screen, off)
+        if self.boss: self.boss.missiles.draw(screen, off)
+        self.player.bullets.draw(screen, off)
+        self.player.draw(screen, off, self.mouse)
+        if self.boss: self.boss.draw(screen, off)
+        PARTICLES.draw(screen, off)
+        screen.blits([(rect_sprite(YELLOW if p['type']=='score' else (PURPLE if p['type']=='life' else GREEN), 18, 18), (int(p['x'])-ox, int(p['y'])-oy)) for p in self.powerups], False)
         # UI
-        score = self.font.render(f"Score: {self.player.score}", True, WHITE); lives = self.font.render(f"Lives: {self.player.lives}", True, WHITE); weapon = self.font.render(f"Weapon LV: {self.player.weapon_lv}", True, WHITE)
+        score = self.hud_text('Score', self.player.score); lives = self.hud_text('Lives', self.player.lives); weapon = self.hud_text('Weapon LV', self.player.weapon_lv)
         self.screen.blit(score,(16,16)); self.screen.blit(lives,(16,48)); self.screen.blit(weapon,(16,80))
         if self.menu:
-            title = self.big.render('DODGE & SHOOT', True, YELLOW); self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 120))
-            txt = self.font.render('Press ENTER to Start  |  M: Toggle Music  |  D: Difficulty', True, WHITE); self.screen.blit(txt, (SCREEN_WIDTH//2 - txt.get_width()//2, 220))
+            title = self.text('DODGE & SHOOT', self.big, YELLOW); self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 120))
+            txt = self.text('Press ENTER to Start  |  M: Toggle Music  |  D: Difficulty'); self.screen.blit(txt, (SCREEN_WIDTH//2 - txt.get_width()//2, 220))
             # highscores
-            hs_title = self.font.render('HIGHSCORES', True, WHITE); self.screen.blit(hs_title, (SCREEN_WIDTH-250, 120))
-            for i, sc in enumerate(HIGHSCORES[:6]): self.screen.blit(self.font.render(f"{i+1}. {sc}", True, WHITE), (SCREEN_WIDTH-250, 150 + i*28))
+            hs_title = self.text('HIGHSCORES'); self.screen.blit(hs_title, (SCREEN_WIDTH-250, 120))
+            for i, sc in enumerate(HIGHSCORES[:6]): self.screen.blit(self.text(f"{i+1}. {sc}"), (SCREEN_WIDTH-250, 150 + i*28))
         if self.game_over:
-            go = self.big.render('GAME OVER', True, RED); self.screen.blit(go, (SCREEN_WIDTH//2-go.get_width()//2, SCREEN_HEIGHT//2-40))
-            txt = self.font.render('Press R to restart or ESC to quit', True, WHITE); self.screen.blit(txt, (SCREEN_WIDTH//2-txt.get_width()//2, SCREEN_HEIGHT//2+30))
+            go = self.text('GAME OVER', self.big, RED); self.screen.blit(go, (SCREEN_WIDTH//2-go.get_width()//2, SCREEN_HEIGHT//2-40))
+            txt = self.text('Press R to restart or ESC to quit'); self.screen.blit(txt, (SCREEN_WIDTH//2-txt.get_width()//2, SCREEN_HEIGHT//2+30))
         pygame.display.flip()
 
+    def text(self, s, font=None, color=WHITE):
+        # static menu/overlay text is rendered once and reused
+        font = font or self.font; key = (font, s, color)
+        surf = self._text_cache.get(key)
+        if surf is None: surf = self._text_cache[key] = font.render(s, True, color)
+        return surf
+
+    def hud_text(self, label, value):
+        # re-render a HUD line only when its value changes
+        last = self._hud.get(label)
+        if last is None or last[0] != value:
+            last = self._hud[label] = (value, self.font.render(f"{label}: {value}", True, WHITE))
+        return last[1]
+
     def handle_events(self):
         for ev in pygame.event.get():
             if ev.type == pygame.QUIT: self.running=False; pygame.quit(); sys.exit()
@@ -529,21 +944,23 @@ class Game:
                     else: self.difficulty='Easy'
                 if ev.key==pygame.K_r and self.game_over: self.reset(); self.menu=False
             if ev.type==pygame.MOUSEBUTTONDOWN and not self.menu and not self.game_over:
-                if ev.button==1: mx,my=pygame.mouse.get_pos(); self.player.shoot(mx-self.camera.offx, my-self.camera.offy)
+                if ev.button==1: mx,my=ev.pos; self.player.shoot(mx-self.camera.offx, my-self.camera.offy)
                 if ev.button==3:
                     b = self.player.drop_bomb();
                     if b: self.bombs.append(b)
             if ev.type==pygame.JOYBUTTONDOWN:
                 # map gamepad buttons (basic)
                 if ev.button==0 and not self.menu: # A
-                    mx, my = pygame.mouse.get_pos(); self.player.shoot(mx-self.camera.offx, my-self.camera.offy)
+                    mx, my = self.mouse; self.player.shoot(mx-self.camera.offx, my-self.camera.offy)
                 if ev.button==1 and not self.menu:
                     b = self.player.drop_bomb();
                     if b: self.bombs.append(b)
 
     def run(self):
         while self.running:
-            self.clock.tick(FPS); self.handle_events(); self.update(); self.draw()
+            self.clock.tick(FPS); self.handle_events(); self.update()
+            # a minimized/hidden window has no pixels to present; skip rendering and the flip entirely
+            if pygame.display.get_active(): self.draw()
 
 # ---------------- Packaging notes -----------------
 # To make an executable: use PyInstaller:
@@ -1,21 +1,22 @@
 import numpy as np
 from skimage import io
-from sklearn.cluster import KMeans
+from sklearn.cluster import MiniBatchKMeans
 import matplotlib.pyplot as plt
 
 # 1. Load image
 image = io.imread("file:///C:/Users/Microsoft/Downloads/istockphoto-2173440246-1024x1024.jpg")
 
-# 2. Reshape to (num_pixels, 3) for RGB
-pixels = image.reshape(-1, 3)
+# 2. Reshape to (num_pixels, 3) for RGB, as float32 so sklearn doesn't lift it to float64
+pixels = image.reshape(-1, 3).astype(np.float32)
 
-# 3. Cluster colors (let’s use 3 main colors)
-kmeans = KMeans(n_clusters=3, random_state=42)
-kmeans.fit(pixels)
+# 3. Cluster colors (let’s use 3 main colors) on a random subsample; 20k pixels are plenty to find 3 centers
+rng = np.random.default_rng(0)
+sample = pixels[rng.choice(len(pixels), size=min(20000, len(pixels)), replace=False)]
+kmeans = MiniBatchKMeans(n_clusters=3, batch_size=1024, n_init=3, random_state=42)
+kmeans.fit(sample)
 
 # 4. Find the largest cluster (most frequent color)
-unique, counts = np.unique(kmeans.labels_, return_counts=True)
-dominant_color = kmeans.cluster_centers_[unique[np.argmax(counts)]]
+dominant_color = kmeans.cluster_centers_[np.bincount(kmeans.labels_).argmax()]
 
 print("Dominant Color (RGB):", dominant_color.astype(int))
 
@@ -1,29 +1,199 @@
+import os
+import argparse
 import numpy as np
-import matplotlib.pyplot as plt
+from PIL import Image
 from skimage import io
+# Intel's scikit-learn-intelex swaps a DAAL-backed KMeans in; optional, and it has to patch before sklearn.cluster
+# is imported
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn()
+    SKLEARNEX = True
+except ImportError:
+    SKLEARNEX = False
 from sklearn.cluster import KMeans
 
-# 1. Load image
-image = io.imread("file:///C:/Users/Microsoft/Downloads/istockphoto-2173440246-1024x1024.jpg")
+# cuML runs the same Lloyd iterations on the GPU; optional, sklearn is the fallback
+try:
+    from cuml.cluster import KMeans as cuKMeans
+except ImportError:
+    cuKMeans = None
+
+# PyTorch runs a plain Lloyd fit on CUDA when cuML isn't there; optional
+try:
+    import torch
+    TORCH_CUDA = torch.cuda.is_available()
+except ImportError:
+    TORCH_CUDA = False
+
+# numba compiles a parallel nearest-center loop; optional, the SGEMM path below is the fallback
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# FAISS-GPU answers the same 1-NN query against the centers on CUDA; optional
+try:
+    import faiss
+    FAISS_GPU = faiss.get_num_gpus() > 0
+except ImportError:
+    FAISS_GPU = False
+
+NB_TILE = 2048  # pixels per block in the numba kernel; its float32 channel copies stay in L1
+
+if njit:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _assign_rgb(R, G, B, ct):
+        # structure-of-arrays: contiguous uint8 R, G, B planes against integer-rounded centers stored transposed,
+        # (3, K) C-contiguous, so each channel's K values sit in one cache line. Per block the loop order is
+        # center-outer, pixel-inner, so the inner loop is unit-stride over one channel and vectorises. Distances
+        # of integer points are at most 3*255^2, exact in float32
+        N = R.shape[0]; K = ct.shape[1]
+        out = np.empty(N, np.int32)
+        for t in prange((N + NB_TILE - 1)//NB_TILE):
+            s = t*NB_TILE; e = min(s+NB_TILE, N); n = e-s
+            r = R[s:e].astype(np.float32); g = G[s:e].astype(np.float32); b = B[s:e].astype(np.float32)
+            bd = np.full(n, np.float32(1e30)); best = np.zeros(n, np.float32)
+            for k in range(K):
+                a0 = ct[0, k]; a1 = ct[1, k]; a2 = ct[2, k]; kf = np.float32(k)
+                for i in range(n):
+                    dr = r[i] - a0; dg = g[i] - a1; db = b[i] - a2
+                    d = dr*dr + dg*dg + db*db
+                    best[i] = kf if d < bd[i] else best[i]; bd[i] = min(d, bd[i])
+            for i in range(n): out[s+i] = np.int32(best[i])
+        return out
+else:
+    _assign_rgb = None
+
+TILE = 32768  # pixel rows per SGEMM block in assign()
+
+def assign(pixels, centers):
+    # labels for uint8 (N, 3) pixels; centers stay float for the fit, only this final pass quantises them. Every
+    # backend labels against the same rounded centers, i.e. the palette that is actually written
+    centers = np.rint(centers).astype(np.float32)
+    if _assign_rgb is not None:
+        R, G, B = (np.ascontiguousarray(pixels[:, j]) for j in range(3))
+        return _assign_rgb(R, G, B, np.ascontiguousarray(centers.T))
+    # with K=12 and D=3 the numba kernel is already memory-bound on the host and beats the upload, so FAISS is
+    # only tried when numba is missing
+    if FAISS_GPU:
+        try:
+            index = faiss.GpuIndexFlatL2(faiss.StandardGpuResources(), 3)
+            index.add(centers)
+            return index.search(pixels.astype(np.float32), 1)[1].ravel()
+        except Exception as e:  # e.g. out of VRAM
+            print("FAISS GPU search failed, falling back to SGEMM:", e)
+    # nearest center per pixel from |x-c|^2 = x.x - 2x.c + c.c: the cross term is one SGEMM, and x.x is the
+    # same for every center of a pixel, so argmin doesn't need it. Rows go in tiles so each (TILE, K) distance
+    # block stays in cache instead of materialising a full (N, K) matrix; each tile is cast to float32 on the way
+    cn = np.einsum('ij,ij->i', centers, centers); ct = np.ascontiguousarray(-2*centers.T)  # (3, K)
+    labels = np.empty(len(pixels), np.intp)
+    for start in range(0, len(pixels), TILE):
+        d2 = pixels[start:start+TILE].astype(np.float32) @ ct
+        d2 += cn
+        labels[start:start+TILE] = d2.argmin(1)
+    return labels
+
+def kmeans_pp(x, c, rng):
+    # k-means++ seeding without a per-candidate Python loop: a running minimum of each point's squared distance
+    # to the chosen centers is updated with one vectorised pass per new center, and the next center is drawn
+    # proportionally to it through a cumulative sum
+    centers = np.empty((c, x.shape[1]), np.float32)
+    closest = np.full(len(x), np.inf, np.float32)
+    pick = rng.integers(len(x))
+    for k in range(c):
+        centers[k] = x[pick]
+        d = x - centers[k]
+        np.minimum(closest, np.einsum('ij,ij->i', d, d), out=closest)
+        if k+1 < c:
+            cum = np.cumsum(closest)
+            pick = min(int(np.searchsorted(cum, rng.uniform()*cum[-1])), len(x)-1)
+    return centers
+
+def fit_torch(sample, c, init=None, max_iter=50, tol=1e-3, device="cuda"):
+    # Lloyd with batched tensor ops: an argmin over squared distances assigns (c.c - 2x.c, as in assign(); no
+    # sqrt, which cdist would take and argmin throws away), index_add_ / bincount move the centers. tol is
+    # relative to the data variance, as in sklearn
+    x = torch.from_numpy(sample).to(device)
+    if init is None: init = kmeans_pp(sample, c, np.random.default_rng(42))
+    cen = torch.from_numpy(np.ascontiguousarray(init, np.float32)).to(device)
+    tol = tol * float(x.var(0).mean())
+    for _ in range(max_iter):
+        lab = torch.addmm((cen*cen).sum(1), x, cen.T, alpha=-2).argmin(1)
+        cnt = torch.bincount(lab, minlength=c).unsqueeze(1)
+        new = torch.zeros_like(cen).index_add_(0, lab, x) / cnt.clamp(min=1)
+        new = torch.where(cnt > 0, new, cen)  # an empty cluster keeps its old center
+        shift = float((new - cen).pow(2).sum()); cen = new
+        if shift <= tol: break
+    return cen.cpu().numpy()
+
+def fit_palette(sample, c, init=None):
+    # one seeded k-means++ start is plenty for a smooth palette, so no restarts. Given the previous image's
+    # centers instead, a similar image (next video frame, same photo series) only needs a few iterations
+    if init is None: kw = dict(init="k-means++", n_init=1, max_iter=50, tol=1e-3)
+    else: kw = dict(init=init, n_init=1, max_iter=5, tol=1e-2)
+    # fit on the GPU when cuML is available, else on the CPU
+    if cuKMeans is not None:
+        try:
+            # cuML names its k-means++ seeding "scalable-k-means++"; "k-means++" is sklearn's spelling
+            cu_kw = dict(kw, init="scalable-k-means++") if init is None else kw
+            return np.asarray(cuKMeans(n_clusters=c, random_state=42, output_type="numpy", **cu_kw).fit(sample).cluster_centers_, np.float32)
+        except Exception as e:  # e.g. out of VRAM
+            print("cuML KMeans failed, falling back to sklearn:", e)
+    elif TORCH_CUDA:
+        try:
+            return fit_torch(sample, c, init, kw["max_iter"], kw["tol"])
+        except Exception as e:
+            print("PyTorch KMeans failed, falling back to sklearn:", e)
+    # on the 20k sample full-batch KMeans is as quick as MiniBatchKMeans and converges tighter. Stock sklearn
+    # gets Elkan's triangle-inequality bounds, which skip most distance evaluations on a well-separated palette;
+    # sklearnex's DAAL kernel only implements Lloyd
+    algorithm = "lloyd" if SKLEARNEX else "elkan"
+    return np.asarray(KMeans(n_clusters=c, algorithm=algorithm, random_state=42, **kw).fit(sample).cluster_centers_, np.float32)
+
+parser = argparse.ArgumentParser(description="Quantize images to a small color palette with KMeans.")
+parser.add_argument("paths", nargs="*", default=["file:///C:/Users/Microsoft/Downloads/istockphoto-2173440246-1024x1024.jpg"])
+parser.add_argument("--show", action="store_true", help="also show original vs segmented with matplotlib")
+args = parser.parse_args()
+if args.show: import matplotlib.pyplot as plt  # only pulled in for interactive use
 
-# 2. Reshape image into (num_pixels, 3) for RGB
-pixels = image.reshape(-1, 3)
 c=12
-# 3. Use KMeans to cluster colors
-kmeans = KMeans(n_clusters=12 ,random_state=42)
-labels = kmeans.fit_predict(pixels)
+paths = args.paths
+rng = np.random.default_rng(42)
+centers = None  # carried over as the warm start for the next image
+for path in paths:
+    # 1. Load image
+    image = io.imread(path)
+
+    # 2. Reshape image into (num_pixels, 3) for RGB; it stays uint8, only the fit sample is converted
+    pixels = image.reshape(-1, 3)
+    # 3. Learn the palette from a random subsample; 20k pixels pin down 12 centers just as well as all of them
+    # (float32 so neither backend lifts it to float64)
+    sample = pixels[rng.choice(len(pixels), size=min(20000, len(pixels)), replace=False)].astype(np.float32)
+    centers = fit_palette(sample, c, init=centers)
+
+    # then label every pixel by its nearest center
+    labels = assign(pixels, centers)
+
+    # 4. Replace pixel values with their cluster center, gathering straight from a uint8 palette so no
+    # full-size float buffer is built and cast
+    palette = np.clip(np.rint(centers), 0, 255).astype(np.uint8)
+    segmented_img = palette[labels].reshape(image.shape)
 
-# 4. Replace pixel values with their cluster center
-segmented_img = kmeans.cluster_centers_[labels].reshape(image.shape).astype(np.uint8)
+    # 5. Save the segmented image into the working directory as <name>_seg<c>.png
+    out = f"{os.path.splitext(os.path.basename(path))[0]}_seg{c}.png"
+    Image.fromarray(segmented_img).save(out, optimize=False)
+    print("Saved", out)
 
-# 5. Show original vs segmented
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 5))
-ax1.imshow(image)
-ax1.set_title("Original Image")
-ax1.axis("off")
+    # and optionally show original vs segmented
+    if args.show:
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 5))
+        ax1.imshow(image)
+        ax1.set_title("Original Image")
+        ax1.axis("off")
 
-ax2.imshow(segmented_img)
-ax2.set_title(f"Segmented Image ({c} colors)")
-ax2.axis("off")
+        ax2.imshow(segmented_img)
+        ax2.set_title(f"Segmented Image ({c} colors)")
+        ax2.axis("off")
 
-plt.show()
+        plt.show()